@@ -1,21 +1,25 @@
 # autotune/autotuner.py
 from __future__ import annotations
 
-import copy
 import csv
+import heapq
 import json
 import math
+import multiprocessing
+import os
 import random
+import statistics
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
 from dataclasses import asdict, dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
 from config import GLOBAL_CONFIG, EvolutionConfig, FitnessConfig
 from tuning_config import GLOBAL_TUNER_CONFIG, EvolutionTuningRanges, FitnessTuningRanges
 from logging_config import setup_logging, get_logger
-from evolution import create_random_genome
 from grammar import decode_genome_to_expr, MappingError
 from engine import safe_eval_expression
 from solver import solve_mathler_with_evolution
@@ -25,7 +29,9 @@ from utils.rng import seed_everything
 logger = get_logger(__name__)
 
 
-@dataclass
+# frozen+slots: TrialConfig is pickled for every pool dispatch, and slotted
+# instances pickle as a plain field tuple instead of a __dict__.
+@dataclass(frozen=True, slots=True)
 class TrialConfig:
     trial_id: int
     genome_length: int
@@ -33,6 +39,41 @@ class TrialConfig:
     fitness: FitnessConfig
 
 
+# ---------- worker bootstrap ----------
+
+# Best score seen so far across the whole run, shared with workers so trials
+# that can no longer beat it stop early. None when pruning is disabled
+# (e.g. run_single_trial called outside the pool).
+_best_score_so_far = None
+
+# A trial is pruned once its optimistic score upper bound falls this far
+# below the shared best.
+_PRUNE_MARGIN = 1.0
+
+
+def _worker_init(best_score=None) -> None:
+    """
+    One-time per-worker warm-up.
+
+    Each pool worker pays module import + grammar-table construction once
+    here instead of on its first trial. We also run one dummy decode so the
+    grammar lookup tables are hot before real work arrives, and stash the
+    shared best-score value used for trial pruning.
+    """
+    global _best_score_so_far
+    _best_score_so_far = best_score
+    # Touch the heavy modules so their import-time work (BNF parsing,
+    # config loading) happens now, not inside the first run_single_trial.
+    import grammar  # noqa: F401
+    import engine  # noqa: F401
+    import solver  # noqa: F401
+
+    try:
+        decode_genome_to_expr([0] * 8)
+    except MappingError:
+        pass
+
+
 # ---------- helpers: paths / dirs ----------
 
 def create_tune_run_dir() -> Path:
@@ -64,15 +105,16 @@ def sample_float(rng: Tuple[float, float]) -> float:
 def sample_evolution_config(ranges: EvolutionTuningRanges,
                             base: EvolutionConfig,
                             genome_length_range: Tuple[int, int]) -> Tuple[EvolutionConfig, int]:
-    ev = copy.deepcopy(base)
-
-    ev.pop_size = sample_int(ranges.pop_size)
-    ev.generations_per_guess = sample_int(ranges.generations_per_guess)
-    ev.mutation_rate = sample_float(ranges.mutation_rate)
-    ev.crossover_rate = sample_float(ranges.crossover_rate)
-    ev.elite_fraction = sample_float(ranges.elite_fraction)
-    ev.mid_fraction = sample_float(ranges.mid_fraction)
-    ev.tournament_size = sample_int(ranges.tournament_size)
+    ev = dataclasses.replace(
+        base,
+        pop_size=sample_int(ranges.pop_size),
+        generations_per_guess=sample_int(ranges.generations_per_guess),
+        mutation_rate=sample_float(ranges.mutation_rate),
+        crossover_rate=sample_float(ranges.crossover_rate),
+        elite_fraction=sample_float(ranges.elite_fraction),
+        mid_fraction=sample_float(ranges.mid_fraction),
+        tournament_size=sample_int(ranges.tournament_size),
+    )
 
     genome_length = sample_int(genome_length_range)
 
@@ -81,17 +123,16 @@ def sample_evolution_config(ranges: EvolutionTuningRanges,
 
 def sample_fitness_config(ranges: FitnessTuningRanges,
                           base: FitnessConfig) -> FitnessConfig:
-    ft = copy.deepcopy(base)
-
-    ft.error_tolerance = sample_float(ranges.error_tolerance)
-    ft.value_weight = sample_float(ranges.value_weight)
-    ft.green_bonus = sample_float(ranges.green_bonus)
-    ft.low_gray_bonus = sample_float(ranges.low_gray_bonus)
-    ft.diversity_bonus_per_symbol = sample_float(ranges.diversity_bonus_per_symbol)
-    ft.diversity_min_symbols = sample_int(ranges.diversity_min_symbols)
-    ft.repeat_guess_penalty = sample_float(ranges.repeat_guess_penalty)
-
-    return ft
+    return dataclasses.replace(
+        base,
+        error_tolerance=sample_float(ranges.error_tolerance),
+        value_weight=sample_float(ranges.value_weight),
+        green_bonus=sample_float(ranges.green_bonus),
+        low_gray_bonus=sample_float(ranges.low_gray_bonus),
+        diversity_bonus_per_symbol=sample_float(ranges.diversity_bonus_per_symbol),
+        diversity_min_symbols=sample_int(ranges.diversity_min_symbols),
+        repeat_guess_penalty=sample_float(ranges.repeat_guess_penalty),
+    )
 
 
 def sample_trial_config(trial_id: int) -> TrialConfig:
@@ -117,38 +158,89 @@ def sample_trial_config(trial_id: int) -> TrialConfig:
     )
 
 
+def sample_trial_configs(num_trials: int) -> List[TrialConfig]:
+    """
+    Sample every trial config for a run in one pre-pass.
+
+    Hoists the tuner/base-config lookups out of the per-trial path so the
+    sampling phase is a single tight loop over the ranges.
+    """
+    tuner = GLOBAL_TUNER_CONFIG
+    evo_ranges = tuner.evolution_ranges
+    fit_ranges = tuner.fitness_ranges
+    base_evo = GLOBAL_CONFIG.evolution
+    base_fit = GLOBAL_CONFIG.fitness
+
+    configs: List[TrialConfig] = []
+    for trial_id in range(num_trials):
+        evo_cfg, genome_length = sample_evolution_config(
+            evo_ranges,
+            base_evo,
+            genome_length_range=evo_ranges.genome_length,
+        )
+        configs.append(TrialConfig(
+            trial_id=trial_id,
+            genome_length=genome_length,
+            evolution=evo_cfg,
+            fitness=sample_fitness_config(fit_ranges, base_fit),
+        ))
+    return configs
+
+
 # ---------- helpers: secret generation ----------
 
-def generate_random_secret_expr(genome_length: int, max_tries: int = 50) -> Tuple[str, float]:
+# Short genomes decode to the same handful of expressions over and over;
+# cache eval results so repeats skip the parse/eval entirely.
+@lru_cache(maxsize=4096)
+def _cached_eval(expr: str) -> float:
+    return float(safe_eval_expression(expr))
+
+
+# Fallback for when no random genome decodes cleanly; evaluated once here
+# instead of per call.
+_FALLBACK_EXPR = "2+3*4"
+_FALLBACK_VAL = float(safe_eval_expression(_FALLBACK_EXPR))
+
+
+def generate_random_secret_expr(genome_length: int, max_tries: int = 50,
+                                batch: int = 64) -> Tuple[str, float]:
     """
     Generate a random valid 6-char expression using the grammar and eval it.
     We:
-      - create a random genome
-      - decode to expr
+      - draw random genomes in bulk (one randbytes call per batch of tries)
+      - decode each to expr
       - eval to get target_value
+    Sampling codons one randint at a time cost genome_length Python calls
+    per try; a single randbytes call covers a whole batch of genomes.
     """
     from engine.mathler_engine import ExpressionError  # local import to avoid cycles
 
-    for _ in range(max_tries):
-        genome = create_random_genome(genome_length)
-        try:
-            expr = decode_genome_to_expr(genome)
-        except MappingError:
-            continue
+    tries = 0
+    while tries < max_tries:
+        n = min(batch, max_tries - tries)
+        buf = random.randbytes(n * genome_length)
+        tries += n
+
+        for i in range(n):
+            genome = list(buf[i * genome_length:(i + 1) * genome_length])
+            try:
+                expr = decode_genome_to_expr(genome)
+            except MappingError:
+                continue
 
-        try:
-            value = safe_eval_expression(expr)
-        except ExpressionError:
-            continue
+            try:
+                value = _cached_eval(expr)
+            except ExpressionError:
+                continue
 
-        # Only accept expressions that are exactly 6 chars, to match game length
-        if len(expr) != 6:
-            continue
+            # Only accept expressions that are exactly 6 chars, to match game length
+            if len(expr) != 6:
+                continue
 
-        return expr, value
+            return expr, value
 
     # As a last resort, fall back to a simple fixed expression
-    return "2+3*4", safe_eval_expression("2+3*4")
+    return _FALLBACK_EXPR, _FALLBACK_VAL
 
 
 # ---------- trial execution ----------
@@ -162,11 +254,16 @@ def run_single_trial(trial_cfg: TrialConfig,
     # Each worker process gets its own seed space
     seed_everything(1234 + trial_cfg.trial_id)
 
-    # Local copy of global config so we don't mutate GLOBAL_CONFIG
-    from config import GlobalConfig  
-    local_global = copy.deepcopy(GLOBAL_CONFIG)
-    local_global.evolution = trial_cfg.evolution
-    local_global.fitness = trial_cfg.fitness
+    # Fresh GlobalConfig for this trial so we don't mutate GLOBAL_CONFIG.
+    # The sections are flat value types, so plain construction beats a
+    # deepcopy walk; solver/autotune sections are read-only and shared.
+    from config import GlobalConfig
+    local_global = GlobalConfig(
+        evolution=trial_cfg.evolution,
+        fitness=trial_cfg.fitness,
+        solver=GLOBAL_CONFIG.solver,
+        autotune=GLOBAL_CONFIG.autotune,
+    )
 
     num_solved = 0
     num_games = games_per_trial
@@ -175,6 +272,7 @@ def run_single_trial(trial_cfg: TrialConfig,
     target_values: List[float] = []
 
     total_game_time = 0.0
+    pruned = False
 
     for _ in range(num_games):
         secret_expr, target_value = generate_random_secret_expr(trial_cfg.genome_length)
@@ -194,16 +292,33 @@ def run_single_trial(trial_cfg: TrialConfig,
         else:
             guesses_list.append(local_global.solver.max_guesses + 4) # failed to solve, count as max + 4 (10 guesses)
 
+        # Prune hopeless trials: even if every remaining game were solved in
+        # one guess, could this trial still beat the best score so far?
+        remaining = num_games - len(guesses_list)
+        if _best_score_so_far is not None and remaining > 0:
+            upper_bound = (
+                (num_solved + remaining) / num_games * 100.0
+                - (sum(guesses_list) + remaining) / num_games * 3.0
+            )
+            if upper_bound < _best_score_so_far.value - _PRUNE_MARGIN:
+                pruned = True
+                break
+
+    # For pruned trials, score over the games actually played.
+    num_games = len(guesses_list)
+
     win_rate = num_solved / num_games if num_games > 0 else 0.0
     avg_guesses = (
-        sum(guesses_list) / len(guesses_list)
+        statistics.fmean(guesses_list)
         if guesses_list else local_global.solver.max_guesses + 1
     )
+    # nsmallest selects the upper-middle element (same as the old
+    # sorted(...)[n // 2]) without sorting the whole list.
     median_guesses = (
-        float(sorted(guesses_list)[len(guesses_list) // 2])
+        float(heapq.nsmallest(len(guesses_list) // 2 + 1, guesses_list)[-1])
         if guesses_list else float(local_global.solver.max_guesses + 1)
     )
-    avg_target_abs = sum(abs(v) for v in target_values) / len(target_values) if target_values else 0.0
+    avg_target_abs = statistics.fmean(map(abs, target_values)) if target_values else 0.0
     mean_runtime = total_game_time / num_games if num_games > 0 else 0.0
 
     # Simple scoring function: prioritise win_rate, then guesses
@@ -224,6 +339,7 @@ def run_single_trial(trial_cfg: TrialConfig,
         "mean_runtime_sec": mean_runtime,
         "total_runtime_sec": total_game_time,
         "score": score,
+        "pruned": int(pruned),
     }
 
     # Flatten evolution and fitness params into the result with prefixes
@@ -235,6 +351,20 @@ def run_single_trial(trial_cfg: TrialConfig,
     return result
 
 
+def _run_single_trial_checked(trial_cfg: TrialConfig,
+                              games_per_trial: int) -> Dict[str, Any] | None:
+    """
+    map()-friendly wrapper around run_single_trial: an exception raised out
+    of executor.map aborts the whole result stream, so failures are logged
+    in the worker and surfaced to the driver as None.
+    """
+    try:
+        return run_single_trial(trial_cfg, games_per_trial)
+    except Exception:
+        logger.exception("Trial %d failed", trial_cfg.trial_id)
+        return None
+
+
 # ---------- main autotune orchestration ----------
 
 def run_autotune() -> None:
@@ -266,6 +396,7 @@ def run_autotune() -> None:
         "mean_runtime_sec",
         "total_runtime_sec",
         "score",
+        "pruned",
     ]
 
     # We need to add evo_*/fit_* fields dynamically from one sample
@@ -283,25 +414,59 @@ def run_autotune() -> None:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
 
-        with ProcessPoolExecutor(max_workers=tuner_cfg.max_workers) as executor:
-            futures = {}
-
-            for trial_id in range(tuner_cfg.num_trials):
-                trial_cfg = sample_trial_config(trial_id)
-                fut = executor.submit(run_single_trial, trial_cfg, tuner_cfg.games_per_trial)
-                futures[fut] = trial_cfg
-
-            for fut in as_completed(futures):
-                trial_cfg = futures[fut]
-                try:
-                    result = fut.result()
-                except Exception as e:
-                    logger.exception("Trial %d failed with error: %s", trial_cfg.trial_id, e)
+        # Best score so far, shared with workers so they can prune trials
+        # that cannot beat it. Updated by the driver on every new best.
+        best_score_val = multiprocessing.Value("d", float("-inf"))
+
+        # One persistent pool for the whole run; workers warm their imports
+        # and grammar tables once in _worker_init instead of per trial.
+        with ProcessPoolExecutor(max_workers=tuner_cfg.max_workers,
+                                 initializer=_worker_init,
+                                 initargs=(best_score_val,)) as executor:
+            # Sample all trial configs up front, then dispatch in chunks:
+            # each IPC round-trip carries chunksize trials instead of one,
+            # so scheduling overhead amortizes across the chunk.
+            trial_cfgs = sample_trial_configs(tuner_cfg.num_trials)
+            chunksize = max(1, tuner_cfg.num_trials // (tuner_cfg.max_workers * 4))
+            run_trial = partial(_run_single_trial_checked,
+                                games_per_trial=tuner_cfg.games_per_trial)
+
+            # Buffer completed rows and flush in batches instead of forcing a
+            # write + flush per trial. The batch size adapts to throughput:
+            # if flushes are rare we shrink it (fresher CSV on disk), if they
+            # are too frequent we grow it (fewer syscalls).
+            pending: List[Dict[str, Any]] = []
+            batch_size = 8
+            last_flush = time.monotonic()
+
+            def _flush_pending() -> None:
+                nonlocal batch_size, last_flush
+                if not pending:
+                    return
+                writer.writerows(pending)
+                csvfile.flush()
+                pending.clear()
+
+                now = time.monotonic()
+                elapsed = now - last_flush
+                if elapsed > 5.0:
+                    batch_size = max(1, batch_size // 2)
+                elif elapsed < 0.2:
+                    batch_size = min(256, batch_size * 2)
+                last_flush = now
+
+            for trial_cfg, result in zip(
+                trial_cfgs,
+                executor.map(run_trial, trial_cfgs, chunksize=chunksize),
+            ):
+                if result is None:
+                    logger.error("Trial %d failed (see worker log)", trial_cfg.trial_id)
                     continue
 
                 results.append(result)
-                writer.writerow(result)
-                csvfile.flush()
+                pending.append(result)
+                if len(pending) >= batch_size or time.monotonic() - last_flush > 2.0:
+                    _flush_pending()
 
                 logger.info(
                     "Trial %3d: win_rate=%.2f, avg_guesses=%.2f, score=%.2f, pop=%d, genome=%d",
@@ -315,6 +480,7 @@ def run_autotune() -> None:
 
                 if best_result is None or result["score"] > best_result["score"]:
                     best_result = result
+                    best_score_val.value = result["score"]
                     logger.info(
                         "New best trial: %d (score=%.2f, win_rate=%.2f, avg_guesses=%.2f)",
                         result["trial_id"],
@@ -322,8 +488,13 @@ def run_autotune() -> None:
                         result["win_rate"],
                         result["avg_guesses_solved"],
                     )
-                    # Write best config to JSON
-                    with best_config_path.open("w") as f:
-                        json.dump(best_result, f, indent=2)
+                    # Write best config to JSON via a temp file + atomic
+                    # rename, so a crash mid-write (or a concurrent reader
+                    # like config.py) never sees a truncated file.
+                    tmp_path = best_config_path.with_suffix(".json.tmp")
+                    tmp_path.write_text(json.dumps(best_result, indent=2))
+                    os.replace(tmp_path, best_config_path)
+
+        _flush_pending()
 
     logger.info("Autotune run complete. Results in %s", tune_dir)
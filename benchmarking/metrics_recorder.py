@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import csv
 import json
+import math
 import os
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -27,11 +28,9 @@ def _safe_json(obj: Any) -> Any:
     if isinstance(obj, dict):
         return {str(k): _safe_json(v) for k, v in obj.items()}
 
-    # dataclass support
-    try:
-        return asdict(obj)  # type: ignore[arg-type]
-    except Exception:
-        pass
+    # dataclass support (checked explicitly; no exception-driven fallthrough)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
 
     # object __dict__ support
     try:
@@ -40,12 +39,58 @@ def _safe_json(obj: Any) -> Any:
         return str(obj)
 
 
+def _fitness_stats(values: Any) -> tuple[float, float, float, float]:
+    """
+    One-pass (mean, max, min, sample std) over an iterable of fitness values,
+    ignoring non-finite entries (-inf marks unmappable/invalid individuals).
+
+    A single fused reduction instead of separate max/min/sum/std traversals.
+    """
+    n = 0
+    s = 0.0
+    s2 = 0.0
+    mn = math.inf
+    mx = -math.inf
+    for x in values:
+        x = float(x)
+        if not math.isfinite(x):
+            continue
+        n += 1
+        s += x
+        s2 += x * x
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+
+    if n == 0:
+        return -math.inf, -math.inf, -math.inf, 0.0
+
+    mean = s / n
+    if n > 1:
+        var = max(0.0, (s2 - n * mean * mean) / (n - 1))
+        std = math.sqrt(var)
+    else:
+        std = 0.0
+    return mean, mx, mn, std
+
+
+# Compact feedback encoding for guesses.csv, built once at import instead of
+# per guess. Keyed by name so both plain strings and TileColor members map.
+_FB_MAP = {"GREEN": "G", "YELLOW": "Y", "GRAY": "X"}
+
+
+def _format_feedback(fb: Any) -> str:
+    _get = _FB_MAP.get
+    return "".join(_get(getattr(x, "name", x), "?") for x in fb)
+
+
 def _now_stamp() -> str:
     # Example: 20251212_142233
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-@dataclass
+@dataclass(slots=True)
 class GameRow:
     run_id: str
     game_id: int
@@ -59,7 +104,7 @@ class GameRow:
     invalid_guess_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GuessRow:
     run_id: str
     game_id: int
@@ -72,7 +117,7 @@ class GuessRow:
     feedback: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationRow:
     run_id: str
     game_id: int
@@ -85,6 +130,18 @@ class GenerationRow:
     fitness_std: float
 
 
+# Row schemas are fixed, so resolve the field names once at import instead of
+# reflecting over the dataclass for every row / writer.
+_GAME_FIELDS = tuple(f.name for f in fields(GameRow))
+_GUESS_FIELDS = tuple(f.name for f in fields(GuessRow))
+_GEN_FIELDS = tuple(f.name for f in fields(GenerationRow))
+
+
+def _row_to_tuple(row: Any, names: tuple) -> tuple:
+    """Flatten a row dataclass to a value tuple in field order for csv.writer."""
+    return tuple(getattr(row, n) for n in names)
+
+
 class MetricsRecorder:
     """
     Collects metrics during solve runs and writes:
@@ -108,9 +165,20 @@ class MetricsRecorder:
 
         self.save_secrets = save_secrets
 
-        self._games: List[GameRow] = []
-        self._guesses: List[GuessRow] = []
-        self._generations: List[GenerationRow] = []
+        # Stream rows straight to disk instead of accumulating them in
+        # memory until write_all(). Handles stay open for the whole run;
+        # memory use is constant no matter how many generations we log.
+        self._games_file, self._games_writer = self._open_csv(
+            self.run_dir / "games.csv", _GAME_FIELDS
+        )
+        self._guesses_file, self._guesses_writer = self._open_csv(
+            self.run_dir / "guesses.csv", _GUESS_FIELDS
+        )
+        self._generations_file, self._generations_writer = self._open_csv(
+            self.run_dir / "generations.csv", _GEN_FIELDS
+        )
+        self._closed = False
+        self._config_written = False
 
         # per-game state
         self._game_id: Optional[int] = None
@@ -138,8 +206,10 @@ class MetricsRecorder:
         self._target_value = float(target_value)
         self._invalid_guess_count = 0
 
-        # Save config once (first game only) OR overwrite each time (fine too).
-        # We'll write it every time but same path; last write wins, identical for run.
+        # The config is identical for every game in a run, so serialize and
+        # write it exactly once, on the first game.
+        if self._config_written:
+            return
         cfg_payload = {
             "run_id": self.run_id,
             "max_guesses": max_guesses,
@@ -150,6 +220,7 @@ class MetricsRecorder:
             },
         }
         (self.run_dir / "config.json").write_text(json.dumps(cfg_payload, indent=2), encoding="utf-8")
+        self._config_written = True
 
     def on_guess_start(self, *, guess_idx: int, history: Any) -> None:
         # We don’t need to store anything at start right now, but hook exists.
@@ -172,8 +243,8 @@ class MetricsRecorder:
         if guess_idx is None or gen_idx is None:
             return
 
-        self._generations.append(
-            GenerationRow(
+        self._generations_writer.writerow(
+            _row_to_tuple(GenerationRow(
                 run_id=self.run_id,
                 game_id=self._game_id,
                 guess_index=int(guess_idx),
@@ -183,7 +254,37 @@ class MetricsRecorder:
                 fitness_max=float(fitness_max),
                 fitness_min=float(fitness_min),
                 fitness_std=float(fitness_std),
-            )
+            ), _GEN_FIELDS)
+        )
+
+    def on_generation_end_fast(
+        self,
+        *,
+        guess_idx: int | None,
+        gen_idx: int | None,
+        gen_runtime_s: float,
+        fitness_values: Any,
+    ) -> None:
+        """
+        Batch variant of on_generation_end: takes the raw population fitness
+        values and computes mean/max/min/std here in a single fused pass, so
+        callers don't need four separate traversals of the population.
+        """
+        if self._game_id is None:
+            return
+        if guess_idx is None or gen_idx is None:
+            return
+
+        fitness_mean, fitness_max, fitness_min, fitness_std = _fitness_stats(fitness_values)
+        self.on_generation_end(
+            guess_idx=guess_idx,
+            gen_idx=gen_idx,
+            gen_runtime_s=gen_runtime_s,
+            population=None,
+            fitness_mean=fitness_mean,
+            fitness_max=fitness_max,
+            fitness_min=fitness_min,
+            fitness_std=fitness_std,
         )
 
     def on_guess_end(
@@ -207,16 +308,15 @@ class MetricsRecorder:
         feedback = ""
         fb = getattr(result, "feedback", None)
         if fb:
-            # feedback appears to be a list[str] like ["GREEN","GRAY",...]
+            # feedback is a list of TileColor members (or plain strings);
             # store compactly as G/Y/X
-            mapping = {"GREEN": "G", "YELLOW": "Y", "GRAY": "X"}
             try:
-                feedback = "".join(mapping.get(x, "?") for x in fb)
+                feedback = _format_feedback(fb)
             except Exception:
                 feedback = str(fb)
 
-        self._guesses.append(
-            GuessRow(
+        self._guesses_writer.writerow(
+            _row_to_tuple(GuessRow(
                 run_id=self.run_id,
                 game_id=self._game_id,
                 guess_index=int(guess_idx),
@@ -225,7 +325,7 @@ class MetricsRecorder:
                 guess_runtime_s=float(guess_runtime_s),
                 guess_fitness=float(guess_fitness),
                 feedback=feedback,
-            )
+            ), _GUESS_FIELDS)
         )
 
     def on_game_end(self, *, history: Any, total_runtime_s: float) -> None:
@@ -250,8 +350,8 @@ class MetricsRecorder:
         
         target_val = float(self._target_value) if self._target_value is not None else 0.0
 
-        self._games.append(
-            GameRow(
+        self._games_writer.writerow(
+            _row_to_tuple(GameRow(
                 run_id=self.run_id,
                 game_id=self._game_id,
                 seed=int(self._seed),
@@ -262,7 +362,7 @@ class MetricsRecorder:
                 total_runtime_s=float(total_runtime_s),
                 avg_runtime_per_guess_s=float(avg_runtime_per_guess),
                 invalid_guess_count=int(self._invalid_guess_count),
-            )
+            ), _GAME_FIELDS)
         )
 
     # -----------------------------
@@ -278,23 +378,27 @@ class MetricsRecorder:
 
     def write_all(self) -> None:
         """
-        Writes games.csv, guesses.csv, generations.csv into run directory.
+        Finalise games.csv, guesses.csv, generations.csv in the run directory.
+
+        Rows are streamed to disk as the hooks fire, so this just flushes
+        and closes the open handles.
         """
-        self._write_csv(self.run_dir / "games.csv", self._games)
-        self._write_csv(self.run_dir / "guesses.csv", self._guesses)
-        self._write_csv(self.run_dir / "generations.csv", self._generations)
+        self.close()
 
-    @staticmethod
-    def _write_csv(path: Path, rows: List[Any]) -> None:
-        if not rows:
-            # still create an empty file with header if possible
-            path.write_text("", encoding="utf-8")
+    def close(self) -> None:
+        """Flush and close the CSV handles. Safe to call more than once."""
+        if self._closed:
             return
+        for f in (self._games_file, self._guesses_file, self._generations_file):
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        self._closed = True
 
-        dict_rows = [asdict(r) for r in rows]
-        fieldnames = list(dict_rows[0].keys())
-
-        with path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            w.writerows(dict_rows)
+    @staticmethod
+    def _open_csv(path: Path, fieldnames: tuple):
+        """Open a CSV for streaming row writes, header included."""
+        f = path.open("w", newline="", encoding="utf-8")
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        return f, writer
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 import random
+from functools import lru_cache
 from typing import Tuple
 import time
 from benchmarking.metrics_recorder import MetricsRecorder
@@ -10,6 +11,14 @@ from grammar import decode_genome_to_expr, MappingError
 from engine.mathler_engine import safe_eval_expression
 from solver import solve_mathler_with_evolution
 
+
+# Random genomes decode to a small set of recurring expressions; caching the
+# eval result skips the parse/eval work on repeats.
+@lru_cache(maxsize=4096)
+def _cached_eval(expr: str) -> float:
+    return float(safe_eval_expression(expr))
+
+
 def generate_secret(
     *,
     rng: random.Random,
@@ -24,7 +33,9 @@ def generate_secret(
     across grammars.
     """
     for _ in range(max_tries):
-        genome = [rng.randint(0, 255) for _ in range(codon_len)]
+        # One C-level randbytes call per attempt instead of codon_len
+        # randint calls; bytes iterate as ints in [0, 255].
+        genome = list(rng.randbytes(codon_len))
         try:
             expr = decode_genome_to_expr(genome)
         except MappingError:
@@ -32,7 +43,7 @@ def generate_secret(
 
         # Filter out expressions that don't evaluate cleanly (div0, etc.)
         try:
-            value = float(safe_eval_expression(expr))
+            value = _cached_eval(expr)
         except Exception:
             continue
 
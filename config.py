@@ -1,11 +1,32 @@
 # config.py
 from dataclasses import dataclass, asdict, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 import json
 
-best_config = json.loads(open("./tunes/best_config.json").read())
 
-@dataclass
+@lru_cache(maxsize=1)
+def _load_best_config() -> MappingProxyType:
+    """
+    Parse tunes/best_config.json exactly once per process.
+
+    Previously the file handle leaked (bare open with no close) and every
+    re-import — e.g. each spawned autotune worker — re-read the file. The
+    cached result is wrapped in MappingProxyType so nothing can mutate the
+    tuned values behind the configs' backs.
+    """
+    with open("./tunes/best_config.json") as f:
+        return MappingProxyType(json.load(f))
+
+
+best_config = _load_best_config()
+
+# Evolution/fitness configs are frozen value types: instances are hashable
+# (usable as cache keys), safe to share across processes, and trial sampling
+# derives variants with dataclasses.replace instead of mutating copies.
+
+@dataclass(frozen=True)
 class EvolutionConfig:
     pop_size: int = best_config["evo_pop_size"]
     genome_length: int = best_config["evo_genome_length"]
@@ -18,7 +39,7 @@ class EvolutionConfig:
     min_char_index: int = 4  # 0-based: codons 0–3 are structural and dont have an effect on selected characters
 
 
-@dataclass
+@dataclass(frozen=True)
 class FitnessConfig:
     wrong_value_penalty: float = best_config["fit_wrong_value_penalty"]
     error_tolerance: float = best_config["fit_error_tolerance"]       # |v - target| must be <= this
@@ -32,10 +53,14 @@ class FitnessConfig:
 
 @dataclass
 class SolverConfig:
-    max_guesses: int = 6          
+    max_guesses: int = 6
     max_expr_length: int = 6
     random_seed: Optional[int] = 42
     log_every_generation: bool = True
+    # Workers for population scoring; 0 keeps scoring in-process. Leave at 0
+    # when games themselves run in a pool (autotune) — nested pools only add
+    # spawn cost.
+    fitness_workers: int = 0
 
 
 @dataclass
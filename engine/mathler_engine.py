@@ -1,32 +1,46 @@
 # engine/mathler_engine.py
 from __future__ import annotations
 
+import logging
+import re
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import List, Optional
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# make_guess sits on the fitness hot path; per-guess trace logging is opt-in
+# so the common case pays nothing for it.
+_DEBUG_TRACE = False
+
 # Feedback types
 
-class TileColor(Enum):
-    GRAY = auto()
-    YELLOW = auto()
-    GREEN = auto()
+# IntEnum with fixed values so feedback can be stored/compared as plain
+# small ints on hot paths (and packed into compact arrays) while members
+# keep their names for logging and stay singletons for `is` comparisons.
+class TileColor(IntEnum):
+    GRAY = 0
+    YELLOW = 1
+    GREEN = 2
 
 # Fast evaluation
 
 _ALLOWED_CHARS = set("0123456789+-*/")
 
+# Deleting every allowed char leaves only the illegal ones, so validation is
+# a single C-level translate instead of a per-char set-lookup loop.
+_STRIP_ALLOWED = str.maketrans("", "", "0123456789+-*/")
+
 
 class ExpressionError(ValueError):
     """Expression is invalid or failed to evaluate."""
 
 
 def _validate_chars(expr: str) -> None:
-    if any(c not in _ALLOWED_CHARS for c in expr):
+    if expr.translate(_STRIP_ALLOWED):
         raise ExpressionError(f"Illegal character in expression: {expr!r}")
 
 
@@ -37,6 +51,136 @@ def _validate_length(expr: str, expected_len: int) -> None:
         )
 
 
+def _eval_arithmetic(expr: str):
+    """
+    Hand-written recursive-descent evaluator for digit/+-*/ expressions.
+
+    Matches Python eval() semantics for this alphabet (precedence, unary
+    signs, // and ** formed from adjacent chars, leading-zero rules) but
+    skips the parse/compile machinery entirely — candidates are evaluated
+    thousands of times per generation, and compile cost dominated.
+    Raises ValueError on malformed input; ZeroDivisionError propagates.
+    """
+    n = len(expr)
+    pos = 0
+
+    # Fast path: with no * or / the whole expression is one signed integer
+    # sum, so a flat accumulator loop replaces the recursive parser. One
+    # bytes-style containment check decides the dispatch.
+    if "*" not in expr and "/" not in expr:
+        total = 0
+        while True:
+            sign = 1
+            while pos < n and expr[pos] in "+-":
+                if expr[pos] == "-":
+                    sign = -sign
+                pos += 1
+            start = pos
+            while pos < n and expr[pos].isdigit():
+                pos += 1
+            tok = expr[start:pos]
+            if not tok or (tok[0] == "0" and tok != "0" * len(tok)):
+                raise ValueError(f"invalid syntax at position {pos}")
+            total += sign * int(tok)
+            if pos == n:
+                return total
+
+    def fail() -> None:
+        raise ValueError(f"invalid syntax at position {pos}")
+
+    def parse_number():
+        nonlocal pos
+        start = pos
+        while pos < n and expr[pos].isdigit():
+            pos += 1
+        if pos == start:
+            fail()
+        tok = expr[start:pos]
+        # Python rejects leading zeros on nonzero literals ("01"),
+        # but allows all-zero ones ("00").
+        if tok[0] == "0" and tok != "0" * len(tok):
+            fail()
+        return int(tok)
+
+    # Precedence mirrors Python: unary binds looser than ** on its left
+    # (-2**2 == -4) while an exponent re-enters unary (2**-1 == 0.5).
+    def parse_unary():
+        nonlocal pos
+        if pos < n and expr[pos] in "+-":
+            op = expr[pos]
+            pos += 1
+            value = parse_unary()
+            return -value if op == "-" else +value
+        return parse_power()
+
+    def parse_power():
+        nonlocal pos
+        base = parse_number()
+        if expr[pos:pos + 2] == "**":
+            pos += 2
+            return base ** parse_unary()
+        return base
+
+    def parse_term():
+        nonlocal pos
+        value = parse_unary()
+        while pos < n and expr[pos] in "*/":
+            if expr[pos:pos + 2] == "//":
+                pos += 2
+                value = value // parse_unary()
+            elif expr[pos] == "*":
+                pos += 1
+                value = value * parse_unary()
+            else:
+                pos += 1
+                value = value / parse_unary()
+        return value
+
+    def parse_sum():
+        nonlocal pos
+        value = parse_term()
+        while pos < n and expr[pos] in "+-":
+            op = expr[pos]
+            pos += 1
+            rhs = parse_term()
+            value = value + rhs if op == "+" else value - rhs
+        return value
+
+    result = parse_sum()
+    if pos != n:
+        fail()
+    return result
+
+
+# The evolution loop re-evaluates the same small set of expressions millions
+# of times per run (converged populations, repeated candidates across
+# generations). Both hot functions are pure, so memoize them: a cache hit is
+# one dict lookup instead of a full character-by-character parse. Failed
+# evaluations are not cached by lru_cache, which is fine — the common case
+# in the hot loop is a valid, repeated expression.
+_eval_arithmetic_cached = lru_cache(maxsize=65536)(_eval_arithmetic)
+
+# DFA-style syntax pre-check, compiled once: exactly the language the
+# evaluator accepts — integer literals without leading zeros (all-zero
+# allowed), unary sign chains, and the operators that can arise from
+# adjacent + - * / chars (including // and **). Matching here guarantees
+# evaluation only fails on arithmetic errors, never on syntax.
+_NUM = r"(?:0+|[1-9][0-9]*)"
+_WELLFORMED_RE = re.compile(
+    rf"[+-]*{_NUM}(?:(?:\*\*|//|[+\-*/])[+-]*{_NUM})*\Z"
+)
+
+
+def is_wellformed_expression(expr: str) -> bool:
+    """
+    Cheap syntactic validity check (one C-level regex match, no exceptions).
+
+    Lets hot loops reject malformed candidates before paying for the full
+    evaluator's raise/except round trip.
+    """
+    return _WELLFORMED_RE.match(expr) is not None
+
+
 def safe_eval_expression(expr: str):
     """
     Fast eval for Mathler expressions.
@@ -45,7 +189,7 @@ def safe_eval_expression(expr: str):
     Returns int or float. 14.0 -> 14, 14.7 stays 14.7.
     """
     try:
-        value = eval(expr, {"__builtins__": None}, {})
+        value = _eval_arithmetic_cached(expr)
     except ZeroDivisionError as e:
         raise ExpressionError(f"Division by zero in {expr!r}") from e
     except Exception as e:
@@ -61,30 +205,59 @@ def safe_eval_expression(expr: str):
 
 # Feedback
 
-def compute_feedback(guess: str, secret: str) -> List[TileColor]:
-    if len(guess) != len(secret):
-        raise ValueError(
-            f"Guess length {len(guess)} != secret length {len(secret)}"
-        )
+# The secret is fixed for a whole game, so build its membership set once
+# per secret rather than substring-scanning it for every guess position
+# (which made compute_feedback O(n^2) per call).
+@lru_cache(maxsize=256)
+def _secret_chars(secret: str) -> frozenset:
+    return frozenset(secret)
+
 
+@lru_cache(maxsize=65536)
+def _compute_feedback_cached(guess: str, secret: str) -> Tuple[TileColor, ...]:
     n = len(secret)
-    feedback: List[TileColor] = [TileColor.GRAY] * n
+    in_secret = _secret_chars(secret)
+    feedback = [TileColor.GRAY] * n
 
     for i in range(n):
         g = guess[i]
         s = secret[i]
         if g == s:
             feedback[i] = TileColor.GREEN
-        elif g in secret:
+        elif g in in_secret:
             feedback[i] = TileColor.YELLOW
         else:
             feedback[i] = TileColor.GRAY
 
-    return feedback
+    # Tuples are immutable, so the cached value is safe to share across calls.
+    return tuple(feedback)
+
+
+def compute_feedback(guess: str, secret: str) -> List[TileColor]:
+    if len(guess) != len(secret):
+        raise ValueError(
+            f"Guess length {len(guess)} != secret length {len(secret)}"
+        )
+    return list(_compute_feedback_cached(guess, secret))
+
+
+def compute_feedback_tuple(guess: str, secret: str) -> Tuple[TileColor, ...]:
+    """
+    Tuple variant of compute_feedback for hot comparison paths: the whole
+    feedback compares with a single tuple equality instead of an
+    element-by-element Python loop, and the cached value is shared.
+    """
+    if len(guess) != len(secret):
+        raise ValueError(
+            f"Guess length {len(guess)} != secret length {len(secret)}"
+        )
+    return _compute_feedback_cached(guess, secret)
 
 # Game state / engine
 
-@dataclass
+# slots=True: results accumulate per guess across every game in a tuning
+# run, and slotted instances skip the per-object __dict__.
+@dataclass(slots=True)
 class GuessResult:
     guess: str
     feedback: List[TileColor]
@@ -136,7 +309,8 @@ class MathlerGame:
         return len(self.secret_expr)
 
     def make_guess(self, guess_expr: str) -> GuessResult:
-        logger.debug("Received guess: %s", guess_expr)
+        if _DEBUG_TRACE:
+            logger.debug("Received guess: %s", guess_expr)
 
         # Basic checks
         try:
@@ -144,7 +318,8 @@ class MathlerGame:
             _validate_chars(guess_expr)
             value = safe_eval_expression(guess_expr)
         except ExpressionError as e:
-            logger.info("Invalid guess %r: %s", guess_expr, e)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Invalid guess %r: %s", guess_expr, e)
             result = GuessResult(
                 guess=guess_expr,
                 feedback=[],
@@ -162,7 +337,8 @@ class MathlerGame:
                 f"Guess {guess_expr!r} evaluates to {value}, "
                 f"expected {self.target_value}"
             )
-            logger.info(msg)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(msg)
             result = GuessResult(
                 guess=guess_expr,
                 feedback=[],
@@ -188,13 +364,15 @@ class MathlerGame:
         )
         self.history.append(result)
 
-        logger.info(
-            "Valid guess %r (value=%s) -> feedback=%s, correct=%s",
-            guess_expr,
-            value,
-            [c.name for c in feedback],
-            is_correct,
-        )
+        # Gate so the feedback-name list is never built when INFO is off.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Valid guess %r (value=%s) -> feedback=%s, correct=%s",
+                guess_expr,
+                value,
+                [c.name for c in feedback],
+                is_correct,
+            )
 
         return result
 
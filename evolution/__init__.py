@@ -2,7 +2,7 @@
 from .genome import Individual, create_random_genome, create_random_individual, init_population
 from .mutation import mutate_genome, hard_mutate_genome
 from .crossover import one_point_crossover
-from .selection import sort_by_fitness, select_survivors, tournament_select
+from .selection import sort_by_fitness, top_by_fitness, select_survivors, tournament_select
 from .evolution_loop import run_generation
 
 __all__ = [
@@ -13,6 +13,7 @@ __all__ = [
     "mutate_genome",
     "one_point_crossover",
     "sort_by_fitness",
+    "top_by_fitness",
     "select_survivors",
     "tournament_select",
     "run_generation",
@@ -11,7 +11,6 @@ from evolution.mutation import mutate_genome
 from evolution.crossover import one_point_crossover
 from fitness.constraints import enforce_uniqueness
 import time
-import math
 
 
 logger = get_logger(__name__)
@@ -33,88 +32,102 @@ def run_generation(population: List[Individual],
       - Breed new individuals with crossover + mutation
       - Preserve a small elite
     Returns new population of same size, with duplicate genomes discouraged.
+
+    Note the returned population is freshly bred: apart from carried-over
+    elites its individuals have no fitness yet, so callers that need scores
+    (e.g. to pick a guess) must run eval_fn on it themselves.
     """
     if not population:
         raise ValueError("Empty population")
     
     t0 = time.perf_counter()
 
-    # Evaluate current population
+    # Evaluate current population. This stays single-threaded on purpose:
+    # the evaluation is pure Python (GIL-bound, so threads cannot overlap
+    # it) and per-generation process pools would pickle every Individual
+    # for less compute than the IPC costs. Parallelism in this project
+    # lives one level up, across autotune trials.
     eval_fn(population)
 
-    # enforce unique phenotypes and re-evaluate
+    # Enforce unique phenotypes, then re-evaluate only the individuals the
+    # dedup actually mutated (their expr was invalidated) instead of making
+    # a second full pass over the whole population. Unmappable genomes also
+    # carry expr=None and get retried here, which is a tiny subset.
     population = enforce_uniqueness(population, evo_cfg)
-    eval_fn(population)
-
-    # Compute fitness stats for this evaluated (and deduped) population
-    fits = [ind.fitness for ind in population if ind.fitness is not None]
-    finite = [f for f in fits if f != float("-inf")]
+    stale = [ind for ind in population if ind.expr is None]
+    if stale:
+        eval_fn(stale)
 
-    fitness_max = max(finite) if finite else float("-inf")
-    fitness_min = min(finite) if finite else float("-inf")
-    fitness_mean = (sum(finite) / len(finite)) if finite else float("-inf")
-    if finite and len(finite) > 1:
-        m = fitness_mean
-        fitness_std = math.sqrt(sum((x - m) ** 2 for x in finite) / (len(finite) - 1))
-    else:
-        fitness_std = 0.0
+    # Fitness values for this evaluated (and deduped) population. The
+    # mean/max/min/std block that lived here ran four separate Python
+    # traversals; the recorder computes all four in one fused pass.
+    fitness_values = [ind.fitness for ind in population]
 
     gen_runtime_s = time.perf_counter() - t0
 
     if metrics is not None:
-        metrics.on_generation_end(
+        metrics.on_generation_end_fast(
             guess_idx=guess_idx,
             gen_idx=gen_idx,
             gen_runtime_s=gen_runtime_s,
-            population=population,
-            fitness_mean=fitness_mean,
-            fitness_max=fitness_max,
-            fitness_min=fitness_min,
-            fitness_std=fitness_std,
+            fitness_values=fitness_values,
         )
 
-    logger.info("Best fitness this generation: %.4f", fitness_max)
+    logger.info("Best fitness this generation: %.4f", max(fitness_values))
 
     survivors = select_survivors(population, evo_cfg)
     pop_size = len(population)
 
-    # Track genomes we've already added (as tuples) to discourage exact duplicates
-    existing_genomes: set[tuple[int, ...]] = set()
+    # Track genomes we've already added to discourage exact duplicates.
+    # Codons are 0-255, so bytes(genome) is a compact key: one allocation
+    # and one hash per genome instead of a tuple hashing every int.
+    existing_genomes: set[bytes] = set()
 
     # Elites: copy top individuals back into new population
     elites = sort_by_fitness(survivors)[:max(1, int(evo_cfg.elite_fraction * pop_size))]
     new_pop: List[Individual] = []
 
     for ind in elites:
-        g_tuple = tuple(ind.genome)
-        if g_tuple in existing_genomes:
+        g_key = bytes(ind.genome)
+        if g_key in existing_genomes:
             continue  # already have this genome in new_pop
-        existing_genomes.add(g_tuple)
-        new_pop.append(Individual(genome=list(ind.genome)))
+        existing_genomes.add(g_key)
+        # Carry the surviving Individual over as-is rather than re-wrapping
+        # it: the outgoing population list is dropped on return, so nothing
+        # else aliases the object, breeding only ever reads parent genomes,
+        # and keeping expr/fitness saves the elite a decode and score next
+        # generation.
+        new_pop.append(ind)
 
     # Breed until we refill the population
     while len(new_pop) < pop_size:
         p1 = tournament_select(survivors, k=evo_cfg.tournament_size)
         p2 = tournament_select(survivors, k=evo_cfg.tournament_size)
 
+        # Crossover output is fresh lists owned by this loop, so mutation
+        # can write into them directly instead of copying each child again.
         g1, g2 = one_point_crossover(p1.genome, p2.genome, evo_cfg)
-        g1 = mutate_genome(g1, evo_cfg)
-        g2 = mutate_genome(g2, evo_cfg)
-
-        for child_genome in (g1, g2):
-            if len(new_pop) >= pop_size:
-                break
-
-            g_tuple = tuple(child_genome)
-            if g_tuple in existing_genomes:
+        g1 = mutate_genome(g1, evo_cfg, in_place=True)
+
+        # Only finish the second child if there's a slot left for it;
+        # when one slot remains the old code built and mutated a child
+        # just to drop it on the floor.
+        if pop_size - len(new_pop) >= 2:
+            children = (g1, mutate_genome(g2, evo_cfg, in_place=True))
+        else:
+            children = (g1,)
+
+        for child_genome in children:
+            g_key = bytes(child_genome)
+            if g_key in existing_genomes:
                 # Try one extra mutation to shake it out of duplication
-                child_genome = mutate_genome(child_genome, evo_cfg)
-                g_tuple = tuple(child_genome)
-                if g_tuple in existing_genomes:
+                child_genome = mutate_genome(child_genome, evo_cfg, in_place=True)
+                g_key = bytes(child_genome)
+                if g_key in existing_genomes:
                     # Still duplicate: skip this child
                     continue
 
-            existing_genomes.add(g_tuple)
+            existing_genomes.add(g_key)
             new_pop.append(Individual(genome=child_genome))
 
     return new_pop
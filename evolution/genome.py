@@ -7,17 +7,28 @@ from typing import List, Optional
 import random
 
 
-@dataclass
+# slots=True: pop_size instances per generation, and the scoring loops read
+# genome/expr/fitness constantly — slotted access skips the __dict__ lookup
+# and shrinks each instance.
+@dataclass(slots=True)
 class Individual:
-    genome: List[int]
+    # Codons live in [0, 255], so the common representation is a bytearray:
+    # one byte per codon instead of a ~28-byte Python int object, which
+    # shrinks per-generation copies and hashing proportionally. A plain list
+    # is still accepted for non-byte codon ranges.
+    genome: bytearray | List[int]
     expr: Optional[str] = None
     fitness: float = float("-inf")
 
 
 def create_random_genome(genome_length: int,
                          codon_min: int = 0,
-                         codon_max: int = 255) -> List[int]:
+                         codon_max: int = 255) -> bytearray | List[int]:
     """Uniform random codons in [codon_min, codon_max]."""
+    if codon_min == 0 and codon_max == 255:
+        # Full byte range: one C-level randbytes call instead of
+        # genome_length separate randint calls.
+        return bytearray(random.randbytes(genome_length))
     return [random.randint(codon_min, codon_max) for _ in range(genome_length)]
 
 
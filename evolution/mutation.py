@@ -2,31 +2,49 @@
 from __future__ import annotations
 
 from typing import List
+import math
 import random
 
 from config import EvolutionConfig
 
 
-def mutate_genome(genome: List[int],
-                  evo_cfg: EvolutionConfig) -> List[int]:
+def mutate_genome(genome: bytearray | List[int],
+                  evo_cfg: EvolutionConfig,
+                  in_place: bool = False) -> bytearray | List[int]:
     """
     Per-gene mutation with probability evo_cfg.mutation_rate.
     Codons are replaced uniformly in [0, 255].
+
+    With in_place=True the caller hands over ownership of `genome` and it is
+    mutated directly — used by the breeding loop, where the input is a
+    freshly created child that nothing else references.
     """
     rate = evo_cfg.mutation_rate
     if rate <= 0.0:
-        return list(genome)
+        return genome if in_place else genome[:]
+
+    # genome[:] preserves the genome type (bytearray or list).
+    new = genome if in_place else genome[:]
+    n = len(new)
+
+    if rate >= 1.0:
+        new[:] = random.randbytes(n)
+        return new
 
-    new = list(genome)
-    for i in range(len(new)):
-        if random.random() < rate:
-            new[i] = random.randint(0, 255)
+    # Jump straight between mutated positions with geometric gap sampling:
+    # one RNG draw per mutation rather than one Bernoulli draw per gene.
+    # The per-gene mutation distribution is unchanged.
+    log_keep = math.log1p(-rate)
+    i = int(math.log(1.0 - random.random()) / log_keep)
+    while i < n:
+        new[i] = random.getrandbits(8)
+        i += 1 + int(math.log(1.0 - random.random()) / log_keep)
     return new
 
 def hard_mutate_genome(
-    genome: List[int],
-    evo_cfg: EvolutionConfig,   
-) -> List[int]:
+    genome: bytearray | List[int],
+    evo_cfg: EvolutionConfig,
+) -> bytearray | List[int]:
     """
     Force mutation on at least one gene, preferring character influencing codons
     (indices >= min_char_index).
@@ -38,5 +56,6 @@ def hard_mutate_genome(
         codon_to_mutate = random.randint(0, min_char_index - 1)
     else:
         codon_to_mutate = random.randint(min_char_index, len(genome) - 1)
-    genome[codon_to_mutate] += 1
+    # Wrap so codons stay in the canonical [0, 255] byte range.
+    genome[codon_to_mutate] = (genome[codon_to_mutate] + 1) % 256
     return genome
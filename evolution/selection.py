@@ -2,14 +2,29 @@
 from __future__ import annotations
 
 from typing import List
+import heapq
 import random
+from operator import attrgetter
 
 from config import EvolutionConfig
 from evolution.genome import Individual
 
+# C-level key extractor shared by every selection helper; cheaper than a
+# fresh lambda per call when these run pop_size times per generation.
+_by_fitness = attrgetter("fitness")
+
 
 def sort_by_fitness(pop: List[Individual]) -> List[Individual]:
-    return sorted(pop, key=lambda ind: ind.fitness, reverse=True)
+    return sorted(pop, key=_by_fitness, reverse=True)
+
+
+def top_by_fitness(pop: List[Individual], n: int) -> List[Individual]:
+    """
+    The n best individuals, best first. Equivalent to sort_by_fitness(pop)[:n]
+    (heapq.nlargest breaks ties the same way a stable reverse sort does) but
+    O(len(pop) log n) instead of sorting everything.
+    """
+    return heapq.nlargest(n, pop, key=_by_fitness)
 
 
 def select_survivors(pop: List[Individual],
@@ -20,22 +35,28 @@ def select_survivors(pop: List[Individual],
     if not pop:
         return []
 
-    pop_sorted = sort_by_fitness(pop)
-    n = len(pop_sorted)
+    n = len(pop)
 
     n_elite = max(1, int(evo_cfg.elite_fraction * n))
     n_mid = max(0, int(evo_cfg.mid_fraction * n))
 
-    elites = pop_sorted[:n_elite]
-    mids = pop_sorted[n_elite:n_elite + n_mid]
+    # Only the top elite+mid band is ever used, so take it with an
+    # O(n log k) partial selection instead of sorting the whole population.
+    top = heapq.nlargest(n_elite + n_mid, pop, key=_by_fitness)
+    elites = top[:n_elite]
+    mids = top[n_elite:]
 
     survivors = list(elites)
-    for ind in mids:
-        if random.random() < 0.5:
-            survivors.append(ind)
+    if mids:
+        # One getrandbits call supplies all the fair coin flips for the
+        # mid band instead of a random() call per individual.
+        coin_bits = random.getrandbits(len(mids))
+        for j, ind in enumerate(mids):
+            if (coin_bits >> j) & 1:
+                survivors.append(ind)
 
     if not survivors:
-        survivors = [pop_sorted[0]]
+        survivors = [top[0]]
 
     return survivors
 
@@ -48,4 +69,4 @@ def tournament_select(pop: List[Individual],
 
     k = min(k, len(pop))
     candidates = random.sample(pop, k)
-    return max(candidates, key=lambda ind: ind.fitness)
+    return max(candidates, key=_by_fitness)
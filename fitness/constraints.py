@@ -1,10 +1,11 @@
 # fitness/constraints.py
 from __future__ import annotations
 
-from typing import List, Set, Dict
+import re
+from typing import List, Optional, Set, Dict
 
 from engine import GuessResult, TileColor
-from engine.mathler_engine import compute_feedback
+from engine.mathler_engine import compute_feedback, compute_feedback_tuple
 from evolution.mutation import hard_mutate_genome
 from evolution.genome import Individual
 from config import EvolutionConfig
@@ -41,25 +42,125 @@ def get_known_green_positions(history: List[GuessResult]) -> Dict[int, str]:
     return known
 
 
+def summarize_history(history: List[GuessResult]) -> tuple:
+    """
+    Single pass over the history producing every per-round artifact the
+    scorer needs: (forbidden frozenset, greens dict, checks tuple,
+    guess_counts dict).
+
+    Equivalent to calling get_forbidden_symbols, get_known_green_positions,
+    build_history_checks and counting guesses separately, but the history is
+    walked once instead of four times.
+    """
+    forbidden: Set[str] = set()
+    greens: Dict[int, str] = {}
+    checks: list = []
+    guess_counts: Dict[str, int] = {}
+
+    for res in history:
+        guess = res.guess
+        guess_counts[guess] = guess_counts.get(guess, 0) + 1
+        if not res.is_valid:
+            continue
+        feedback = tuple(res.feedback)
+        checks.append((guess, feedback))
+        for i, color in enumerate(feedback):
+            if color is TileColor.GRAY:
+                forbidden.add(guess[i])
+            elif color is TileColor.GREEN:
+                greens[i] = guess[i]
+
+    return frozenset(forbidden), greens, tuple(checks), guess_counts
+
+
+def build_compatibility_prefilter(forbidden: Set[str],
+                                  greens: Dict[int, str]):
+    """
+    Compile the GREEN/GRAY gates of is_expr_compatible_with_history into one
+    regex: position i must be the known green symbol, any other position must
+    avoid the forbidden set. One C-level fullmatch then replaces both Python
+    loops per candidate. Accept/reject behaviour is identical to the loops
+    for 6-char candidates; returns None when there is nothing to encode.
+    """
+    if not forbidden and not greens:
+        return None
+    if any(ch in forbidden for ch in greens.values()):
+        # Contradictory history: the loops reject every candidate (the green
+        # symbol itself trips the forbidden check), so match nothing.
+        return re.compile(r"(?!)").fullmatch
+    other = "[^" + "".join(map(re.escape, sorted(forbidden))) + "]" if forbidden else "."
+    pattern = "".join(
+        re.escape(greens[i]) if i in greens else other
+        for i in range(6)
+    )
+    return re.compile(pattern).fullmatch
+
+
+def build_history_checks(history: List[GuessResult]) -> tuple:
+    """
+    Precompute the (guess, expected feedback tuple) pairs the compatibility
+    simulation needs, skipping invalid entries once, so per-candidate checks
+    don't re-filter and re-tuple the history every call.
+    """
+    return tuple(
+        (res.guess, tuple(res.feedback))
+        for res in history
+        if res.is_valid
+    )
+
+
 def is_expr_compatible_with_history(expr: str,
-                                    history: List[GuessResult]) -> bool:
+                                    history: List[GuessResult],
+                                    forbidden: Set[str] | None = None,
+                                    greens: Dict[int, str] | None = None,
+                                    checks: tuple | None = None,
+                                    prefilter=None) -> bool:
     """
     Check if a candidate expression could be the secret, given past feedback.
     We simulate feedback as if 'expr' were the secret and ensure it matches
     the recorded feedback for each valid guess.
+
+    `forbidden` and `greens` may be passed in by callers that evaluate many
+    candidates against the same history, so the history is not re-scanned
+    per candidate.
     """
-    for res in history:
-        if not res.is_valid:
-            continue
+    # Pool workers receive the summarized artifacts instead of the history
+    # itself, so an empty history only means "no constraints" when no
+    # precomputed checks or prefilter were supplied either.
+    if not history and checks is None and prefilter is None:
+        return True
 
-        simulated = compute_feedback(res.guess, expr)
+    # Cheap O(n) gates first: a candidate that violates a known GREEN or
+    # contains a GRAY symbol can never match the recorded feedback, so the
+    # vast majority of incompatible candidates never reach the full
+    # per-entry feedback simulation below. Both rejections are implied by
+    # that simulation, so the accept/reject behaviour is unchanged.
+    # Batch callers hand in the gates pre-compiled as a single regex
+    # (build_compatibility_prefilter); it only encodes 6-char candidates,
+    # so anything else falls back to the loops.
+    if prefilter is not None and len(expr) == 6:
+        if not prefilter(expr):
+            return False
+    else:
+        if greens is None:
+            greens = get_known_green_positions(history)
+        for i, ch in greens.items():
+            if i < len(expr) and expr[i] != ch:
+                return False
 
-        if len(simulated) != len(res.feedback):
+        if forbidden is None:
+            forbidden = get_forbidden_symbols(history)
+        if forbidden and not forbidden.isdisjoint(expr):
             return False
 
-        for c1, c2 in zip(simulated, res.feedback):
-            if c1 is not c2:
-                return False
+    if checks is None:
+        checks = build_history_checks(history)
+
+    # One tuple equality (length included) per entry replaces the per-tile
+    # zip loop; the simulated tuple itself comes from the engine's cache.
+    for guess, expected in checks:
+        if compute_feedback_tuple(guess, expr) != expected:
+            return False
 
     return True
 
@@ -69,15 +170,22 @@ def enforce_uniqueness(population: List[Individual], evo_cfg: EvolutionConfig) -
     with duplicates mutated. This may still contain duplicates after mutation,
     but should reduce their frequency.
     """
-    seen: Set[str] = set()
-    unique_population: List[Individual] = []
+    seen: Set = set()
     for ind in population:
-        if ind.expr not in seen:
-            seen.add(ind.expr)
-            unique_population.append(ind)
+        # Dedup on the phenotype when we have one; individuals without a
+        # decoded expr (unmappable genomes) are keyed by their genome bytes
+        # so two distinct failed genomes don't shadow each other under a
+        # shared None key.
+        key = ind.expr if ind.expr is not None else bytes(ind.genome)
+        if key not in seen:
+            seen.add(key)
         else:
             ind.genome = hard_mutate_genome(ind.genome, evo_cfg)
-            unique_population.append(ind)
-    return unique_population
+            # Invalidate the stale phenotype so callers can spot (and
+            # re-evaluate) exactly the individuals that changed.
+            ind.expr = None
+            ind.fitness = float("-inf")
+    # Individuals are adjusted in place; no need to rebuild the list.
+    return population
 
 
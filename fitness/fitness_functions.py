@@ -5,13 +5,22 @@ from typing import List
 
 from config import FitnessConfig
 from engine import GuessResult, safe_eval_expression
+from engine.mathler_engine import is_wellformed_expression
 from .constraints import get_forbidden_symbols, get_known_green_positions, is_expr_compatible_with_history  # still useful
 
 
 def score_expression(expr: str,
                      target_value: float,
                      history: List[GuessResult],
-                     cfg: FitnessConfig) -> float:
+                     cfg: FitnessConfig,
+                     *,
+                     forbidden=None,
+                     greens=None,
+                     guess_counts=None,
+                     history_checks=None,
+                     prefilter=None,
+                     green_pairs=None,
+                     gray_strip=None) -> float:
     """
     Score a single expression.
 
@@ -25,8 +34,21 @@ def score_expression(expr: str,
         - penalty for repeat guesses
       - bonus for using fewer gray symbols from history
       - diversity bonus for many unique, non-forbidden symbols
+
+    History is constant while a whole population is scored, so batch callers
+    pass the precomputed `forbidden` set, `greens` mapping and `guess_counts`
+    (guess -> times guessed); each defaults to a fresh scan of the history
+    for one-off calls.
     """
-    # 1) Evaluate
+    # Deliberately plain Python rather than a compiled kernel: this project
+    # carries no native-code dependencies, and the layered caches (engine
+    # eval/feedback, per-round score cache) mean this body runs once per
+    # distinct expression per guess round rather than once per individual.
+    # 1) Evaluate. The regex gate rejects malformed candidates without the
+    # evaluator's exception round trip; the try only catches arithmetic
+    # failures (division by zero, overflow) on well-formed input.
+    if not is_wellformed_expression(expr):
+        return float("-inf")
     try:
         value = safe_eval_expression(expr)
     except Exception:
@@ -42,36 +64,57 @@ def score_expression(expr: str,
 
     # 3) Base score: closer is better
     # score -= diff * cfg.value_weight
-    
-    # 4) gray-based bonus (soft)
-    #    Forbidden = symbols we've seen as GRAY in valid guesses.
-    forbidden = get_forbidden_symbols(history)
-    num_gray_used = sum(1 for s in expr if s in forbidden)
+
+    # 4) Repeat-guess check, pulled ahead of the soft bonuses: a repeated
+    # guess is dominated by its penalty regardless of bonus terms, so there
+    # is no point paying for the gray/green/diversity scans or the history
+    # compatibility simulation (the most expensive step) on its behalf.
+    if guess_counts is None:
+        guess_counts = {}
+        for res in history:
+            guess_counts[res.guess] = guess_counts.get(res.guess, 0) + 1
+    repeats = guess_counts.get(expr, 0)
+    if repeats:
+        # Penalty per occurrence, matching the old per-entry loop.
+        return score - cfg.repeat_guess_penalty * repeats
+
+    # 5) gray-based bonus (soft)
+    #    Forbidden = symbols we've seen as GRAY in valid guesses. Batch
+    #    callers precompute a str.maketrans deletion table for them, so the
+    #    count is one C-level translate instead of a per-char generator.
+    if forbidden is None:
+        forbidden = get_forbidden_symbols(history)
+    if gray_strip is None:
+        gray_strip = str.maketrans("", "", "".join(forbidden))
+    num_gray_used = len(expr) - len(expr.translate(gray_strip))
     if num_gray_used < 3:
         score += cfg.low_gray_bonus
     else:
         score -= num_gray_used * (cfg.low_gray_bonus / 2)
     
-    # 5) green bonus
-    greens = get_known_green_positions(history)
-    if greens:
-        for idx, ch in greens.items():
-            if idx < len(expr) and expr[idx] == ch:
-                score += cfg.green_bonus
+    # 6) green bonus. Batch callers hand the greens in as a flat tuple of
+    # (position, char) pairs so the hot loop iterates a tuple rather than
+    # allocating a dict items view per candidate.
+    if green_pairs is None:
+        if greens is None:
+            greens = get_known_green_positions(history)
+        green_pairs = tuple(greens.items())
+    for idx, ch in green_pairs:
+        if idx < len(expr) and expr[idx] == ch:
+            score += cfg.green_bonus
 
-    # 6) Diversity bonus
-    unique_symbols = len(set(expr))
-    for symbol in set(expr):
-        if symbol in forbidden:
-            unique_symbols -= 1
+    # 7) Diversity bonus: count unique non-forbidden symbols with set
+    # arithmetic instead of building set(expr) twice and looping.
+    symbols = set(expr)
+    unique_symbols = len(symbols) - len(symbols & forbidden)
     score += unique_symbols * cfg.diversity_bonus_per_symbol
 
-    # 7) Check history compatibility (hard)
-    if not is_expr_compatible_with_history(expr, history):
+    # 8) Check history compatibility (hard) — last, because it is the most
+    # expensive term and only candidates that survived everything above
+    # reach it.
+    if not is_expr_compatible_with_history(expr, history, forbidden=forbidden,
+                                           greens=greens, checks=history_checks,
+                                           prefilter=prefilter):
         score -= cfg.history_incopatibility_penalty
 
-    # 8) Check if expr was already guessed (hard)
-    for res in history:
-        if expr == res.guess:
-            score -= cfg.repeat_guess_penalty  # heavy penalty
     return score
@@ -1,18 +1,57 @@
 # fitness/mathler_eval.py
 from __future__ import annotations
 
-from typing import List
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 
 from config import FitnessConfig
 from evolution.genome import Individual
-from grammar import decode_genome_to_expr, MappingError
+from grammar import decode_genome_bytes
 from fitness import score_expression
+from fitness.constraints import build_compatibility_prefilter, summarize_history
 from engine import GuessResult
 
+# Below this population size the IPC cost of shipping genomes to workers
+# exceeds the scoring work itself, so the pool is bypassed.
+_PARALLEL_THRESHOLD = 200
+
+
+def _score_chunk(genomes, target_value, cfg, forbidden, greens, guess_counts,
+                 history_checks):
+    """
+    Score a chunk of genomes in a worker process.
+
+    Takes the precomputed history artifacts instead of the raw history so
+    the payload pickles as plain tuples/sets; returns (expr, fitness) pairs
+    aligned with the input chunk.
+    """
+    # Rebuilt per chunk (bound methods don't pickle); one compile per chunk
+    # is noise next to the scoring it accelerates.
+    prefilter = build_compatibility_prefilter(forbidden, greens)
+    green_pairs = tuple(greens.items())
+    gray_strip = str.maketrans("", "", "".join(forbidden))
+    out = []
+    for genome in genomes:
+        expr = decode_genome_bytes(genome)
+        if expr is None:
+            out.append((None, float("-inf")))
+            continue
+        fitness = score_expression(
+            expr, target_value, [], cfg,
+            forbidden=forbidden, greens=greens, guess_counts=guess_counts,
+            history_checks=history_checks, prefilter=prefilter,
+            green_pairs=green_pairs, gray_strip=gray_strip,
+        )
+        out.append((expr, fitness))
+    return out
+
 
 def make_eval_population_mathler(target_value: float,
                                  history: List[GuessResult],
-                                 cfg: FitnessConfig):
+                                 cfg: FitnessConfig,
+                                 pool: Optional[ProcessPoolExecutor] = None,
+                                 pool_workers: Optional[int] = None):
     """
     Factory that returns an eval_fn suitable for the evolution loop.
 
@@ -20,22 +59,92 @@ def make_eval_population_mathler(target_value: float,
       - decodes each individual's genome to an expr
       - scores it with score_expression
       - stores expr and fitness on the Individual
+
+    Scoring runs batched over the *unique* expressions in the population:
+    converged populations decode to the same handful of strings, so scoring
+    each distinct expr once and fanning the result out does a fraction of
+    the eval/feedback work of a straight per-individual loop.
+
+    If a ProcessPoolExecutor is supplied (and the population is large enough
+    to beat the IPC overhead), scoring fans out across its workers instead;
+    `pool_workers` tells the chunking how many workers the caller gave the
+    pool. The pool is deliberately caller-owned: it outlives this factory,
+    so the per-spawn startup cost is paid once per run, not per guess.
     """
+    # The history is fixed for the lifetime of this eval_fn (one guess
+    # round), so derive all its artifacts here in one scan instead of
+    # re-walking the history inside every score_expression call.
+    forbidden, greens, history_checks, guess_counts = summarize_history(history)
+
+    # GREEN/GRAY gates compiled once per round into a single regex; the
+    # compatibility check then spends one fullmatch instead of two Python
+    # loops per candidate.
+    prefilter = build_compatibility_prefilter(forbidden, greens)
+    green_pairs = tuple(greens.items())
+    gray_strip = str.maketrans("", "", "".join(forbidden))
+
+    # Scores are a pure function of (expr, target, history, cfg), all fixed
+    # for this factory's lifetime, so they are cached across generations:
+    # expressions that reappear in later generations (elites, converged
+    # populations) skip eval, feedback simulation and scoring entirely.
+    score_cache: dict = {}
 
     def eval_population(population: List[Individual]) -> None:
+        if pool is not None and len(population) >= _PARALLEL_THRESHOLD:
+            n_workers = pool_workers or os.cpu_count() or 1
+            chunk_size = (len(population) + n_workers - 1) // n_workers
+            # Genomes cross the process boundary as bytes, not lists of
+            # Python ints: one contiguous buffer per genome pickles (and
+            # copies) in a fraction of the bytes and decodes identically.
+            chunks = [
+                [bytes(ind.genome) for ind in population[a:a + chunk_size]]
+                for a in range(0, len(population), chunk_size)
+            ]
+            results = pool.map(
+                _score_chunk,
+                chunks,
+                [target_value] * len(chunks),
+                [cfg] * len(chunks),
+                [forbidden] * len(chunks),
+                [greens] * len(chunks),
+                [guess_counts] * len(chunks),
+                [history_checks] * len(chunks),
+            )
+            i = 0
+            for chunk_result in results:
+                for expr, fitness in chunk_result:
+                    population[i].expr = expr
+                    population[i].fitness = fitness
+                    i += 1
+            return
+
+        # Pass 1: decode everything and collect the distinct expressions.
+        exprs: List[str | None] = []
+        unique_exprs: dict[str, float] = {}
         for ind in population:
-            try:
-                expr = decode_genome_to_expr(ind.genome)
-            except MappingError:
-                # Unmappable genome: treat as very bad
-                ind.expr = None
-                ind.fitness = float("-inf")
-                continue
+            # Memoized: unmappable genomes come back as None (very bad)
+            expr = decode_genome_bytes(ind.genome)
+            exprs.append(expr)
+            if expr is not None:
+                unique_exprs[expr] = float("-inf")
 
-            # We let score_expression handle evaluation and scoring.
-            fitness = score_expression(expr, target_value, history, cfg)
+        # Pass 2: score each distinct expression exactly once, reusing
+        # scores from earlier generations where possible.
+        for expr in unique_exprs:
+            score = score_cache.get(expr)
+            if score is None:
+                score = score_expression(
+                    expr, target_value, history, cfg,
+                    forbidden=forbidden, greens=greens, guess_counts=guess_counts,
+                    history_checks=history_checks, prefilter=prefilter,
+                    green_pairs=green_pairs, gray_strip=gray_strip,
+                )
+                score_cache[expr] = score
+            unique_exprs[expr] = score
 
+        # Pass 3: fan results back out to the individuals.
+        for ind, expr in zip(population, exprs):
             ind.expr = expr
-            ind.fitness = fitness
+            ind.fitness = float("-inf") if expr is None else unique_exprs[expr]
 
     return eval_population
@@ -1,6 +1,6 @@
 # grammar/__init__.py
 from .grammar_defs import GRAMMAR, START_SYMBOL, is_nonterminal
-from .decoder import decode_genome_to_expr, MappingError
+from .decoder import decode_genome_to_expr, decode_genome_bytes, MappingError
 from .encoder import encode_expr_to_genome, EncodingError
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "START_SYMBOL",
     "is_nonterminal",
     "decode_genome_to_expr",
+    "decode_genome_bytes",
     "MappingError",
     "encode_expr_to_genome",
     "EncodingError",
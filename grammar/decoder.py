@@ -1,7 +1,8 @@
 # grammar/decoder.py
 from __future__ import annotations
 
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .grammar_defs import GRAMMAR, START_SYMBOL, is_nonterminal
 
@@ -10,7 +11,52 @@ class MappingError(ValueError):
     """Genome could not be fully mapped to a valid expression."""
 
 
-def decode_genome_to_expr(genome: List[int],
+# The grammar is compiled once at import into integer-coded tables so the
+# decode loop never touches strings: terminals get ids >= 0 (indexing
+# _TERMINAL_STRS), nonterminals get ids < 0. is_nonterminal becomes a sign
+# check instead of startswith/endswith text tests, and symbol hashing
+# disappears from the hot loop entirely.
+_TERMINAL_STRS: List[str] = []
+_TERM_ID: Dict[str, int] = {}
+_NT_ID: Dict[str, int] = {}
+
+
+def _symbol_id(sym: str) -> int:
+    if is_nonterminal(sym):
+        nt_id = _NT_ID.get(sym)
+        if nt_id is None:
+            nt_id = ~len(_NT_ID)
+            _NT_ID[sym] = nt_id
+        return nt_id
+    term_id = _TERM_ID.get(sym)
+    if term_id is None:
+        term_id = len(_TERMINAL_STRS)
+        _TERM_ID[sym] = term_id
+        _TERMINAL_STRS.append(sym)
+    return term_id
+
+
+# Codons are bytes, so the codon % num_productions choice is precomputable:
+# one 256-entry expansion table per nonterminal, each expansion a tuple of
+# symbol ids. At decode time picking a production is a single indexed load —
+# no dict .get, no len(), no modulo per expansion. Expansions are stored
+# reversed, ready to be pushed onto the decode stack so popping yields the
+# symbols left to right. Nonterminals that appear in expansions but have no
+# productions of their own get a None slot so the lookup keeps raising the
+# same MappingError below.
+_START_ID = _symbol_id(START_SYMBOL)
+_ID_EXPANSIONS_REV: Dict[int, Tuple[Tuple[int, ...], ...]] = {
+    _symbol_id(sym): tuple(
+        tuple(_symbol_id(s) for s in reversed(productions[c % len(productions)]))
+        for c in range(256)
+    )
+    for sym, productions in GRAMMAR.items()
+    if productions
+}
+_NT_NAMES = {nt_id: sym for sym, nt_id in _NT_ID.items()}
+
+
+def decode_genome_to_expr(genome: Sequence[int],
                           max_expansions: int = 100) -> str:
     """
     Map a list of codons to a 6-char expression using the grammar.
@@ -23,39 +69,67 @@ def decode_genome_to_expr(genome: List[int],
     if not genome:
         raise MappingError("Empty genome")
 
-    symbols: List[str] = [START_SYMBOL]
     codon_idx = 0
     expansions = 0
     genome_len = len(genome)
 
-    while any(is_nonterminal(s) for s in symbols):
+    # Stack-based leftmost expansion: everything left of the leftmost
+    # nonterminal is terminal and already emitted to `out`, so popping the
+    # stack expands nonterminals in exactly the order (and with exactly the
+    # codons) the old rescan-and-splice loop used — without the O(L) scan
+    # and list rebuild per expansion.
+    stack: List[int] = [_START_ID]
+    out: List[int] = []
+
+    while stack:
+        sym = stack.pop()
+        if sym >= 0:
+            out.append(sym)
+            continue
+
         if expansions >= max_expansions:
             raise MappingError(
                 f"Exceeded max_expansions={max_expansions} while mapping genome"
             )
 
-        # Expand first nonterminal from left
-        for i, sym in enumerate(symbols):
-            if is_nonterminal(sym):
-                productions = GRAMMAR.get(sym)
-                if not productions:
-                    raise MappingError(f"No productions for nonterminal {sym!r}")
-
-                codon = genome[codon_idx % genome_len]
-                codon_idx += 1
+        expansions_for_sym = _ID_EXPANSIONS_REV.get(sym)
+        if expansions_for_sym is None:
+            raise MappingError(
+                f"No productions for nonterminal {_NT_NAMES[sym]!r}"
+            )
 
-                choice = codon % len(productions)
-                expansion = productions[choice]
+        codon = genome[codon_idx % genome_len]
+        codon_idx += 1
 
-                # Replace symbol at i with the chosen expansion
-                symbols = symbols[:i] + expansion + symbols[i + 1 :]
-                expansions += 1
-                break
+        stack.extend(expansions_for_sym[codon & 0xFF])
+        expansions += 1
 
-    expr = "".join(symbols)
+    expr = "".join(_TERMINAL_STRS[s] for s in out)
 
     if len(expr) != 6:
         # Should not happen if grammar is correct
         raise MappingError(f"Mapped expression {expr!r} has length {len(expr)}, not 6")
 
     return expr
+
+
+@lru_cache(maxsize=1 << 16)
+def _decode_cached(genome_key: bytes) -> Optional[str]:
+    try:
+        # bytes index as ints, so the decoder consumes the key directly.
+        return decode_genome_to_expr(genome_key)
+    except MappingError:
+        return None
+
+
+def decode_genome_bytes(genome: Sequence[int]) -> Optional[str]:
+    """
+    Memoized decode for hot loops: returns the expression, or None for
+    unmappable genomes instead of raising.
+
+    Genomes repeat heavily across generations (elites, children of the same
+    parents), so caching on the compact bytes key skips the whole grammar
+    expansion on repeats — including repeated failures, which cost a raise
+    through decode_genome_to_expr on every miss.
+    """
+    return _decode_cached(bytes(genome))
@@ -1,6 +1,7 @@
 # grammar/encoder.py
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, Tuple
 
 from engine import safe_eval_expression
@@ -10,32 +11,40 @@ from .grammar_defs import GRAMMAR, START_SYMBOL, is_nonterminal, TERMINALS
 class EncodingError(ValueError):
     """Failed to encode expression into a genome."""
 
-# Recursive descent parser to recover the leftmost derivation
+# Recursive descent parser to recover the leftmost derivation.
+#
+# Memoized on (symbol, expr, pos): the backtracking descent re-derives the
+# same (symbol, position) subproblems many times — and across calls the same
+# expressions recur — so this is effectively a parse chart filled lazily,
+# one dict hit per already-seen span instead of a re-parse. Results are
+# immutable tuples, safe to share between cached entries.
 
-def _parse_symbol(symbol: str, expr: str, pos: int) -> Tuple[bool, int, List[Tuple[str, int]]]:
+@lru_cache(maxsize=1 << 15)
+def _parse_symbol(symbol: str, expr: str, pos: int) -> Tuple[bool, int, Tuple[Tuple[str, int], ...]]:
     """
     Try to parse `expr` starting at `pos` according to `symbol`.
 
     Returns (success, new_pos, choices), where:
       - success: True / False
       - new_pos: index in expr after parsing this symbol
-      - choices: list of (nonterminal, production_index) used in this subtree,
-                 in the order they would be consumed by the decoder (leftmost).
+      - choices: tuple of (nonterminal, production_index) used in this
+                 subtree, in the order they would be consumed by the
+                 decoder (leftmost).
     """
     # Terminal: single character like "1", "+", "-", etc.
     if not is_nonterminal(symbol):
         if pos >= len(expr) or expr[pos] != symbol:
-            return False, pos, []
-        return True, pos + 1, []
+            return False, pos, ()
+        return True, pos + 1, ()
 
     # Nonterminal: try each production in order
     productions = GRAMMAR.get(symbol)
     if not productions:
-        return False, pos, []
+        return False, pos, ()
 
     for prod_idx, prod in enumerate(productions):
         cur_pos = pos
-        choices: List[Tuple[str, int]] = [(symbol, prod_idx)]  # record this expansion first
+        choices: Tuple[Tuple[str, int], ...] = ((symbol, prod_idx),)  # record this expansion first
 
         ok = True
         for child_sym in prod:
@@ -43,13 +52,13 @@ def _parse_symbol(symbol: str, expr: str, pos: int) -> Tuple[bool, int, List[Tup
             if not child_ok:
                 ok = False
                 break
-            choices.extend(child_choices)
+            choices += child_choices
 
         if ok:
             return True, cur_pos, choices
 
     # No production matched
-    return False, pos, []
+    return False, pos, ()
 
 
 
@@ -1,6 +1,8 @@
 # grammar/grammar_defs.py
 from __future__ import annotations
 
+import os
+import pickle
 from pathlib import Path
 from typing import Dict, List, Set
 
@@ -10,8 +12,35 @@ from .bnf_loader import load_bnf, is_nonterminal  # re-export helper
 _THIS_DIR = Path(__file__).resolve().parent
 _BNF_FILE = _THIS_DIR / "mathler_unconstrained.bnf"
 
+# The parsed grammar is cached as a pickle next to the BNF so repeated
+# imports — one per worker process when a pool is in use — load it with a
+# single read instead of re-parsing the text. The cache is ignored when
+# older than the BNF, and any load failure falls back to parsing.
+_CACHE_FILE = _BNF_FILE.with_name(_BNF_FILE.name + ".pkl")
+
+
+def _load_grammar():
+    try:
+        if _CACHE_FILE.stat().st_mtime >= _BNF_FILE.stat().st_mtime:
+            with _CACHE_FILE.open("rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    parsed = load_bnf(_BNF_FILE)
+    try:
+        # Write-then-rename so concurrent importers never see a partial file.
+        tmp = _CACHE_FILE.with_name(_CACHE_FILE.name + f".tmp{os.getpid()}")
+        with tmp.open("wb") as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _CACHE_FILE)
+    except OSError:
+        pass  # read-only installs still work, just without the cache
+    return parsed
+
+
 # Load at import time
-START_SYMBOL, GRAMMAR, TERMINALS = load_bnf(_BNF_FILE)
+START_SYMBOL, GRAMMAR, TERMINALS = _load_grammar()
 
 __all__ = [
     "START_SYMBOL",
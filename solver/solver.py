@@ -1,12 +1,14 @@
 # solver/solver.py
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
 from config import GLOBAL_CONFIG
 from logging_config import get_logger
 from engine import MathlerGame, GuessResult
-from evolution import init_population, run_generation, Individual, sort_by_fitness
+from evolution import init_population, run_generation, Individual, top_by_fitness
 from fitness import make_eval_population_mathler
 import time
 
@@ -38,6 +40,10 @@ def solve_mathler_with_evolution(
     evo_cfg = global_config.evolution
     fit_cfg = global_config.fitness
 
+    # Checked once: tuning runs play thousands of games at WARNING, and the
+    # per-guess log lines below build their arguments eagerly.
+    log_info = logger.isEnabledFor(logging.INFO)
+
     # Initial random population
     population: List[Individual] = init_population(
         size=evo_cfg.pop_size,
@@ -61,97 +67,115 @@ def solve_mathler_with_evolution(
 
     t_game0 = time.perf_counter()
 
-
-    # Game loop: up to max_guesses
-    for guess_idx in range(game.max_guesses):
-        logger.info("Guess %d / %d", guess_idx + 1, game.max_guesses)
-
-        t_guess0 = time.perf_counter()
-        if metrics is not None:
-            metrics.on_guess_start(guess_idx=guess_idx, history=history)
-
-        # Build evaluation function with current history
-        eval_fn = make_eval_population_mathler(
-            target_value=game.target_value,
-            history=history,
-            cfg=fit_cfg,
-        )
-
-        # Run several evolutionary generations before making a guess
-        for gen in range(evo_cfg.generations_per_guess):
-            population = run_generation(
-                population,
-                evo_cfg,
-                eval_fn,
-                guess_idx=guess_idx,
-                gen_idx=gen,
-                metrics=metrics,
+    # One persistent pool for the whole game (when enabled): eval_fn is
+    # rebuilt every guess round, but the workers — and their imports — are
+    # spawned exactly once.
+    n_workers = global_config.solver.fitness_workers
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 0 else None
+
+    try:
+        # Game loop: up to max_guesses
+        for guess_idx in range(game.max_guesses):
+            if log_info:
+                logger.info("Guess %d / %d", guess_idx + 1, game.max_guesses)
+
+            t_guess0 = time.perf_counter()
+            if metrics is not None:
+                metrics.on_guess_start(guess_idx=guess_idx, history=history)
+
+            # Build evaluation function with current history
+            eval_fn = make_eval_population_mathler(
+                target_value=game.target_value,
+                history=history,
+                cfg=fit_cfg,
+                pool=pool,
+                pool_workers=n_workers if pool is not None else None,
             )
 
-
-        # Ensure final population for this guess is evaluated
-        eval_fn(population)
-
-        # Find last valid guess (if any)
-        last_valid_guess = None
-        for res in reversed(history):
-            if res.is_valid:
-                last_valid_guess = res.guess
+            # Run several evolutionary generations before making a guess
+            for gen in range(evo_cfg.generations_per_guess):
+                population = run_generation(
+                    population,
+                    evo_cfg,
+                    eval_fn,
+                    guess_idx=guess_idx,
+                    gen_idx=gen,
+                    metrics=metrics,
+                )
+
+
+            # Ensure final population for this guess is evaluated
+            eval_fn(population)
+
+            # Find last valid guess (if any)
+            last_valid_guess = None
+            for res in reversed(history):
+                if res.is_valid:
+                    last_valid_guess = res.guess
+                    break
+
+            # Only the top few candidates matter, so take them with a
+            # partial selection instead of sorting the whole population.
+            ranked = top_by_fitness(population, 5)
+
+            # Try the top 5, skipping any that repeat the last valid guess
+            candidate = None
+            for ind in ranked:
+                if ind.expr is None:
+                    continue
+                if last_valid_guess is not None and ind.expr == last_valid_guess:
+                    continue
+                candidate = ind
                 break
 
-        # Sort population by fitness (best first)
-        ranked = sort_by_fitness(population)
-
-        # Try the top 5, skipping any that repeat the last valid guess
-        candidate = None
-        for ind in ranked[:5]:
-            if ind.expr is None:
-                continue
-            if last_valid_guess is not None and ind.expr == last_valid_guess:
-                continue
-            candidate = ind
-            break
-
-        # Fallback: if no suitable candidate found, use the best anyway
-        if candidate is None:
-            candidate = ranked[0]
-
-        best = candidate
-        guess_expr = best.expr if best.expr is not None else "0+0+0"
-
-        logger.info(
-            "Chosen guess %r with fitness=%.3f (last_valid_guess=%r)",
-            guess_expr,
-            best.fitness,
-            last_valid_guess,
-        )
-
-        # Submit guess to the game
-        result = game.make_guess(guess_expr)
-        history.append(result)
-
-        guess_runtime_s = time.perf_counter() - t_guess0
-        if metrics is not None:
-            metrics.on_guess_end(
-                guess_idx=guess_idx,
-                guess_expr=guess_expr,
-                guess_fitness=best.fitness,
-                result=result,
-                guess_runtime_s=guess_runtime_s,
-                population=population,
-            )
-
-
-        logger.info(
-            "Guess result: valid=%s, correct=%s, feedback=%s",
-            result.is_valid,
-            result.is_correct,
-            [c.name for c in result.feedback] if result.feedback else [],
-        )
-
-        if result.is_correct:
-            logger.info("Solved in %d guesses", len(history))
-            break
+            # Fallback: if no suitable candidate found, use the best anyway
+            if candidate is None:
+                candidate = ranked[0]
+
+            best = candidate
+            guess_expr = best.expr if best.expr is not None else "0+0+0"
+
+            if log_info:
+                logger.info(
+                    "Chosen guess %r with fitness=%.3f (last_valid_guess=%r)",
+                    guess_expr,
+                    best.fitness,
+                    last_valid_guess,
+                )
+
+            # Submit guess to the game
+            result = game.make_guess(guess_expr)
+            history.append(result)
+
+            guess_runtime_s = time.perf_counter() - t_guess0
+            if metrics is not None:
+                metrics.on_guess_end(
+                    guess_idx=guess_idx,
+                    guess_expr=guess_expr,
+                    guess_fitness=best.fitness,
+                    result=result,
+                    guess_runtime_s=guess_runtime_s,
+                    population=population,
+                )
+
+
+            if log_info:
+                # The feedback name list is the one genuinely eager argument
+                # here, so it only gets built when INFO is live.
+                logger.info(
+                    "Guess result: valid=%s, correct=%s, feedback=%s",
+                    result.is_valid,
+                    result.is_correct,
+                    [c.name for c in result.feedback] if result.feedback else [],
+                )
+
+            if result.is_correct:
+                if log_info:
+                    logger.info("Solved in %d guesses", len(history))
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     if not game.is_solved():
         logger.info("Failed to solve within %d guesses", game.max_guesses)
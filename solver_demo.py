@@ -10,14 +10,13 @@ ALLOWED_CHARS = set("0123456789+-*/")
 GENOME_LENGTH = 20 
 
 
+# Indexed by TileColor value (GRAY=0, YELLOW=1, GREEN=2).
+_FB_CHARS = ".YG"
+
+
 def format_feedback(feedback):
     # G = green, Y = yellow, . = gray
-    return "".join(
-        "G" if c is TileColor.GREEN else
-        "Y" if c is TileColor.YELLOW else
-        "."
-        for c in feedback
-    )
+    return "".join(_FB_CHARS[c] for c in feedback)
 
 
 def prompt_secret():